@@ -4,82 +4,214 @@ System Test Script for Alerting & Notification Platform
 Tests basic functionality to ensure the system is working correctly.
 """
 
-import requests
-import json
+import functools
+import io
+import sys
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = 'http://127.0.0.1:5000'
 
+# User alert interaction endpoints, exercised in this order
+USER_ALERT_ACTIONS = (
+    '/api/user/alerts/{a}/read',
+    '/api/user/alerts/{a}/snooze',
+    '/api/user/alerts/{a}/unread',
+)
+
+# Test output is collected here and written out once per section
+BUF = io.StringIO()
+
+# Per-thread line list used to keep concurrent probe output in probe order
+_CAPTURE = threading.local()
+
+def log(msg):
+    """Append a line of test output to the section buffer."""
+    lines = getattr(_CAPTURE, 'lines', None)
+    if lines is not None:
+        lines.append(msg)
+    else:
+        BUF.write(msg + '\n')
+
+def flush_log():
+    """Write the buffered section output to stdout in a single call."""
+    sys.stdout.write(BUF.getvalue())
+    sys.stdout.flush()
+    BUF.truncate(0)
+    BUF.seek(0)
+
+def flushes_log(func):
+    """Flush buffered output when func exits, so a crash never drops diagnostics."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            flush_log()
+    return wrapper
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# (connect, read) timeouts in seconds so a down server fails fast
+REQUEST_TIMEOUT = (1.0, 5.0)
+
+# Shared HTTP session so every test call reuses the same keep-alive connection
+SESSION = None
+
+# Supported HTTP methods mapped to the shared session's request functions
+DISPATCH = {}
+
+# Set when a request fails to connect at all, as opposed to any other error
+SERVER_UNREACHABLE = threading.Event()
+
+def get_session():
+    """Return the shared requests session, creating it on first use."""
+    global SESSION
+    if SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        SESSION = requests.Session()
+        # BASE_URL is loopback, so skip per-request proxy/netrc lookups from the environment
+        SESSION.trust_env = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16)
+        SESSION.mount('http://', adapter)
+        SESSION.mount('https://', adapter)
+        DISPATCH.update({'GET': SESSION.get, 'POST': SESSION.post, 'PUT': SESSION.put})
+    return SESSION
+
+# JSON (loads, dumps) pair, resolved on first use
+_JSON_CODEC = None
+
+def _json_codec():
+    """Return (loads, dumps), preferring orjson when it is installed."""
+    global _JSON_CODEC
+    if _JSON_CODEC is None:
+        try:
+            import orjson
+            _JSON_CODEC = (orjson.loads, orjson.dumps)
+        except ImportError:
+            import json
+            _JSON_CODEC = (json.loads, lambda obj: json.dumps(obj).encode('utf-8'))
+    return _JSON_CODEC
+
 def test_api_endpoint(method, endpoint, data=None, expected_status=200):
     """Test an API endpoint and return the response."""
+    import requests
+    
+    json_loads, json_dumps = _json_codec()
     url = f"{BASE_URL}{endpoint}"
     
     try:
-        if method.upper() == 'GET':
-            response = requests.get(url)
-        elif method.upper() == 'POST':
-            response = requests.post(url, json=data, headers={'Content-Type': 'application/json'})
-        elif method.upper() == 'PUT':
-            response = requests.put(url, json=data, headers={'Content-Type': 'application/json'})
-        else:
+        method = method.upper()
+        get_session()
+        fn = DISPATCH.get(method)
+        if fn is None:
             raise ValueError(f"Unsupported method: {method}")
         
-        print(f"{'✅' if response.status_code == expected_status else '❌'} {method} {endpoint} - Status: {response.status_code}")
+        if method == 'GET':
+            response = fn(url, timeout=REQUEST_TIMEOUT)
+        else:
+            body = json_dumps(data) if data is not None else None
+            response = fn(url, data=body, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+        
+        log(f"{'✅' if response.status_code == expected_status else '❌'} {method} {endpoint} - Status: {response.status_code}")
         
         if response.status_code != expected_status:
-            print(f"   Expected: {expected_status}, Got: {response.status_code}")
-            print(f"   Response: {response.text[:200]}...")
+            log(f"   Expected: {expected_status}, Got: {response.status_code}")
+            log(f"   Response: {response.text[:200]}...")
         
-        return response.json() if response.content else {}
+        return json_loads(response.content) if response.content else {}
         
     except requests.exceptions.ConnectionError:
-        print(f"❌ Connection failed to {url}")
-        print("   Make sure the server is running: python run.py")
+        SERVER_UNREACHABLE.set()
+        log(f"❌ Connection failed to {url}")
+        log("   Make sure the server is running: python run.py")
         return None
     except Exception as e:
-        print(f"❌ Error testing {method} {endpoint}: {str(e)}")
+        log(f"❌ Error testing {method} {endpoint}: {str(e)}")
         return None
 
+def _run_probe(probe):
+    """Run one probe, returning its result and the lines it logged."""
+    _CAPTURE.lines = []
+    try:
+        return test_api_endpoint(*probe), _CAPTURE.lines
+    finally:
+        _CAPTURE.lines = None
+
+def run_probes(probes):
+    """Run independent probes concurrently and log their output in probe order."""
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        outcomes = list(ex.map(_run_probe, probes))
+    
+    results = []
+    for result, lines in outcomes:
+        for line in lines:
+            log(line)
+        results.append(result)
+    return results
+
+@flushes_log
 def run_comprehensive_tests():
-    """Run comprehensive system tests."""
-    print("🧪 Starting Alerting Platform System Tests")
-    print("=" * 50)
+    """Run comprehensive system tests. Returns False if the server is unreachable."""
+    from datetime import datetime, timedelta, timezone
+    
+    log("🧪 Starting Alerting Platform System Tests")
+    log("=" * 50)
     
     # Test 1: System Health
-    print("\n📊 Testing System Health...")
+    log("\n📊 Testing System Health...")
+    SERVER_UNREACHABLE.clear()
     health = test_api_endpoint('GET', '/api/analytics/system/health')
+    if SERVER_UNREACHABLE.is_set():
+        log("❌ Server unreachable; aborting.")
+        flush_log()
+        return False
+    
     if health and health.get('system_health', {}).get('overall_status') == 'healthy':
-        print("✅ System is healthy")
+        log("✅ System is healthy")
     else:
-        print("⚠️  System health check failed")
+        log("⚠️  System health check failed")
+    
+    flush_log()
     
     # Test 2: Admin APIs
-    print("\n👨‍💼 Testing Admin APIs...")
+    log("\n👨‍💼 Testing Admin APIs...")
+    
+    # The admin list endpoints don't depend on each other, so fetch them together
+    list_probes = [
+        ('GET', '/api/admin/users'),
+        ('GET', '/api/admin/teams'),
+        ('GET', '/api/admin/alerts'),
+    ]
+    users_response, teams_response, alerts_response = run_probes(list_probes)
     
     # List users
-    users_response = test_api_endpoint('GET', '/api/admin/users')
+    admin_users, regular_users = [], []
     if users_response and 'users' in users_response:
         users = users_response['users']
-        admin_users = [u for u in users if u['is_admin']]
-        regular_users = [u for u in users if not u['is_admin']]
-        print(f"   Found {len(users)} users ({len(admin_users)} admins, {len(regular_users)} regular)")
+        for u in users:
+            (admin_users if u['is_admin'] else regular_users).append(u)
+        log(f"   Found {len(users)} users ({len(admin_users)} admins, {len(regular_users)} regular)")
     
     # List teams
-    teams_response = test_api_endpoint('GET', '/api/admin/teams')
     if teams_response and 'teams' in teams_response:
         teams = teams_response['teams']
-        print(f"   Found {len(teams)} teams")
+        log(f"   Found {len(teams)} teams")
     
     # List alerts
-    alerts_response = test_api_endpoint('GET', '/api/admin/alerts')
     if alerts_response and 'alerts' in alerts_response:
         alerts = alerts_response['alerts']
-        active_alerts = [a for a in alerts if a['is_active']]
-        print(f"   Found {len(alerts)} alerts ({len(active_alerts)} active)")
+        active_count = sum(1 for a in alerts if a['is_active'])
+        log(f"   Found {len(alerts)} alerts ({active_count} active)")
+    
+    flush_log()
     
     # Test 3: Create New Alert
-    print("\n➕ Testing Alert Creation...")
+    log("\n➕ Testing Alert Creation...")
+    expiry = (datetime.now(timezone.utc) + timedelta(hours=24)).isoformat(timespec='seconds')
     if admin_users:
         admin_id = admin_users[0]['id']
         new_alert_data = {
@@ -88,13 +220,13 @@ def run_comprehensive_tests():
             "severity": "info",
             "visibility_type": "organization",
             "created_by": admin_id,
-            "expiry_time": (datetime.utcnow() + timedelta(hours=24)).isoformat() + "Z"
+            "expiry_time": expiry
         }
         
         create_response = test_api_endpoint('POST', '/api/admin/alerts', new_alert_data, 201)
         if create_response and create_response.get('success'):
             test_alert_id = create_response['alert']['id']
-            print(f"   Created test alert with ID: {test_alert_id}")
+            log(f"   Created test alert with ID: {test_alert_id}")
             
             # Test updating the alert
             update_data = {
@@ -105,10 +237,12 @@ def run_comprehensive_tests():
             
             # Test archiving the alert
             test_api_endpoint('POST', f'/api/admin/alerts/{test_alert_id}/archive')
-            print("   Cleaned up test alert")
+            log("   Cleaned up test alert")
+    
+    flush_log()
     
     # Test 4: User APIs
-    print("\n👤 Testing User APIs...")
+    log("\n👤 Testing User APIs...")
     if regular_users:
         test_user = regular_users[0]
         user_id = test_user['id']
@@ -117,75 +251,82 @@ def run_comprehensive_tests():
         user_alerts = test_api_endpoint('GET', f'/api/user/alerts?user_id={user_id}')
         if user_alerts and 'alerts' in user_alerts:
             alerts_count = len(user_alerts['alerts'])
-            print(f"   User {test_user['name']} has {alerts_count} visible alerts")
+            log(f"   User {test_user['name']} has {alerts_count} visible alerts")
             
             # Test user dashboard
             dashboard = test_api_endpoint('GET', f'/api/user/dashboard?user_id={user_id}')
             if dashboard and 'summary' in dashboard:
                 summary = dashboard['summary']
-                print(f"   Dashboard: {summary['unread_count']} unread, {summary['read_count']} read, {summary['snoozed_count']} snoozed")
+                log(f"   Dashboard: {summary['unread_count']} unread, {summary['read_count']} read, {summary['snoozed_count']} snoozed")
             
             # Test alert interactions if there are alerts
             if alerts_count > 0:
                 alert_id = user_alerts['alerts'][0]['id']
                 
-                # Test marking as read
-                test_api_endpoint('POST', f'/api/user/alerts/{alert_id}/read', {'user_id': user_id})
-                
-                # Test snoozing
-                test_api_endpoint('POST', f'/api/user/alerts/{alert_id}/snooze', {'user_id': user_id})
-                
-                # Test marking as unread
-                test_api_endpoint('POST', f'/api/user/alerts/{alert_id}/unread', {'user_id': user_id})
+                # Test marking as read, snoozing, then marking as unread
+                payload = {'user_id': user_id}
+                for tmpl in USER_ALERT_ACTIONS:
+                    test_api_endpoint('POST', tmpl.format(a=alert_id), payload)
                 
-                print("   Tested alert interactions (read/snooze/unread)")
+                log("   Tested alert interactions (read/snooze/unread)")
+    
+    flush_log()
     
     # Test 5: Analytics APIs
-    print("\n📈 Testing Analytics APIs...")
+    log("\n📈 Testing Analytics APIs...")
+    
+    # These read-only probes are independent, so fire them concurrently
+    probes = [
+        ('GET', '/api/analytics/overview'),
+        ('GET', '/api/analytics/alerts/performance?limit=10'),
+        ('GET', '/api/analytics/trends/daily?days=7'),
+        ('GET', '/api/analytics/users/engagement?limit=10'),
+    ]
+    overview = run_probes(probes)[0]
     
     # Overview
-    overview = test_api_endpoint('GET', '/api/analytics/overview')
     if overview and 'overview' in overview:
         ov = overview['overview']
-        print(f"   System overview: {ov['alerts']['total']} total alerts, {ov['users']['total_users']} users")
-    
-    # Alert performance
-    test_api_endpoint('GET', '/api/analytics/alerts/performance?limit=10')
+        log(f"   System overview: {ov['alerts']['total']} total alerts, {ov['users']['total_users']} users")
     
-    # Daily trends
-    test_api_endpoint('GET', '/api/analytics/trends/daily?days=7')
-    
-    # User engagement
-    test_api_endpoint('GET', '/api/analytics/users/engagement?limit=10')
+    flush_log()
     
     # Test 6: Notification History
-    print("\n📜 Testing Notification History...")
+    log("\n📜 Testing Notification History...")
     if regular_users:
         user_id = regular_users[0]['id']
         history = test_api_endpoint('GET', f'/api/user/notifications/history?user_id={user_id}&per_page=5')
         if history and 'deliveries' in history:
-            print(f"   Found {len(history['deliveries'])} notification deliveries")
+            log(f"   Found {len(history['deliveries'])} notification deliveries")
+    
+    flush_log()
     
     # Test 7: System Statistics
-    print("\n📊 Testing System Statistics...")
+    log("\n📊 Testing System Statistics...")
     stats = test_api_endpoint('GET', '/api/admin/stats/system')
     if stats:
-        print("   Retrieved system statistics successfully")
-    
-    print("\n" + "=" * 50)
-    print("🎉 System Tests Completed!")
-    print("\nNext steps:")
-    print("1. Check the application logs for any errors")
-    print("2. Test the reminder system by waiting 2 hours or triggering manually")
-    print("3. Create alerts with different visibility types")
-    print("4. Test with different user accounts")
-    print("\nFor manual testing, use the sample admin account:")
-    print("- Email: admin@example.com")
-    print("- Create alerts via: POST /api/admin/alerts")
+        log("   Retrieved system statistics successfully")
+    
+    flush_log()
+    
+    log("\n" + "=" * 50)
+    log("🎉 System Tests Completed!")
+    log("\nNext steps:")
+    log("1. Check the application logs for any errors")
+    log("2. Test the reminder system by waiting 2 hours or triggering manually")
+    log("3. Create alerts with different visibility types")
+    log("4. Test with different user accounts")
+    log("\nFor manual testing, use the sample admin account:")
+    log("- Email: admin@example.com")
+    log("- Create alerts via: POST /api/admin/alerts")
+    
+    flush_log()
+    return True
 
+@flushes_log
 def test_reminder_system():
     """Test the reminder system functionality."""
-    print("\n⏰ Testing Reminder System...")
+    log("\n⏰ Testing Reminder System...")
     
     # Get active alerts
     alerts_response = test_api_endpoint('GET', '/api/admin/alerts?status=active')
@@ -198,12 +339,14 @@ def test_reminder_system():
             reminder_response = test_api_endpoint('POST', f'/api/admin/alerts/{alert_id}/send-reminder')
             
             if reminder_response and reminder_response.get('success'):
-                print(f"   ✅ Successfully triggered reminder for alert {alert_id}")
-                print(f"   Sent {reminder_response.get('reminders_sent', 0)} reminders")
+                log(f"   ✅ Successfully triggered reminder for alert {alert_id}")
+                log(f"   Sent {reminder_response.get('reminders_sent', 0)} reminders")
             else:
-                print("   ⚠️  Reminder trigger failed or no users needed reminders")
+                log("   ⚠️  Reminder trigger failed or no users needed reminders")
         else:
-            print("   ℹ️  No active alerts found to test reminders")
+            log("   ℹ️  No active alerts found to test reminders")
+    
+    flush_log()
 
 if __name__ == '__main__':
     print("🚀 Alerting & Notification Platform - System Test")
@@ -213,10 +356,10 @@ if __name__ == '__main__':
     # Wait a moment for user to see the message
     time.sleep(2)
     
-    # Run the tests
-    run_comprehensive_tests()
-    
-    # Test reminder system
+    # Run the tests, then the reminder system if the server responded
+    if not run_comprehensive_tests():
+        sys.exit(1)
     test_reminder_system()
     
+    from datetime import datetime
     print(f"\n✨ All tests completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}") 
\ No newline at end of file